@@ -6,7 +6,6 @@ from typing import Tuple
 import bpy
 
 from . import globs
-from .type_annotations import SMCObData
 
 
 class SMC_UL_Combine_List(bpy.types.UIList):
@@ -32,7 +31,11 @@ class SMC_UL_Combine_List(bpy.types.UIList):
     @staticmethod
     def _draw_mat(row: bpy.types.UILayout, item: Any, index: int) -> None:
         row.separator()
-        row.label(text='', icon_value=item.mat.preview.icon_id if item.mat.preview else 'QUESTION')
+        preview = item.mat.preview
+        if preview:
+            row.label(text='', icon_value=preview.icon_id)
+        else:
+            row.label(text='', icon='QUESTION')
         row.prop(item.mat, 'name', text='')
         col = row.column(align=True)
         col.alignment = 'RIGHT'
@@ -49,26 +52,31 @@ class SMC_UL_Combine_List(bpy.types.UIList):
     def filter_items(self, context: bpy.types.Context, data: Any, propname: str) -> Tuple[List[int], List[int]]:
         data = getattr(data, propname)
         filter_name = self.filter_name.lower()
+        cl_object = globs.CL_OBJECT
+        cl_material = globs.CL_MATERIAL
 
-        matched_materials_ob = {
-            item.ob
-            for item in data
-            if item.type == globs.CL_MATERIAL and filter_name in item.mat.name.lower()
-        }
+        rows = [(item.type, item.ob, item.mat.name if item.type == cl_material else '') for item in data]
+        matched_rows = [
+            item_type == cl_material and filter_name in mat_name.lower()
+            for item_type, _, mat_name in rows
+        ]
+        matched_materials_ob = {ob for (_, ob, _), matched in zip(rows, matched_rows) if matched}
 
         flt_flags = [
             self.bitflag_filter_item
-            if (item.type == globs.CL_MATERIAL and filter_name in item.mat.name.lower()) or
-               (item.type == globs.CL_OBJECT and item.ob in matched_materials_ob)
+            if matched or (item_type == cl_object and ob in matched_materials_ob)
             else 0
-            for item in data
+            for (item_type, ob, _), matched in zip(rows, matched_rows)
         ]
 
-        flt_neworder = self._filter_by_names(data) if self.use_filter_sort_alpha else []
+        flt_neworder = []
+        if self.use_filter_sort_alpha:
+            flt_neworder = self._filter_by_names([mat_name for _, _, mat_name in rows])
         return flt_flags, flt_neworder
 
     @staticmethod
-    def _filter_by_names(data: SMCObData) -> List[int]:
-        sorted_items = sorted(enumerate(data), key=lambda x: x[1].mat.name if x[1].type == globs.CL_MATERIAL else '')
-        sorted_pairs = sorted(enumerate(sorted_items), key=lambda x: x[1])
-        return [x[0] for x in sorted_pairs]
+    def _filter_by_names(names: List[str]) -> List[int]:
+        flt_neworder = [0] * len(names)
+        for new_idx, idx in enumerate(sorted(range(len(names)), key=names.__getitem__)):
+            flt_neworder[idx] = new_idx
+        return flt_neworder
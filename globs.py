@@ -22,3 +22,8 @@ smc_pi = False
 CL_OBJECT = 0
 CL_MATERIAL = 1
 CL_SEPARATOR = 2
+
+GITHUB_ISSUES_URL = 'https://github.com/Grim-es/material-combiner-addon/issues'
+DISCORD_URL = 'https://discordapp.com/users/275608234595713024'
+PATREON_URL = 'https://www.patreon.com/shotariya'
+BUYMEACOFFEE_URL = 'https://buymeacoffee.com/shotariya'
@@ -7,11 +7,15 @@ import bpy.utils.previews
 from ..type_annotations import SMCIcons
 
 smc_icons = cast(SMCIcons, None)
+smc_icon_ids = {}
 icons_directory = os.path.dirname(__file__)
 
 
 def get_icon_id(identifier: str) -> int:
-    return get_icon(identifier).icon_id
+    icon_id = smc_icon_ids.get(identifier)
+    if icon_id is None:
+        icon_id = smc_icon_ids[identifier] = get_icon(identifier).icon_id
+    return icon_id
 
 
 def get_icon(identifier: str) -> bpy.types.ImagePreview:
@@ -33,7 +37,9 @@ def get_img_icon(identifier: str, path: str) -> bpy.types.ImagePreview:
 def initialize_smc_icons() -> None:
     global smc_icons
     smc_icons = bpy.utils.previews.new()
+    smc_icon_ids.clear()
 
 
 def unload_smc_icons() -> None:
     bpy.utils.previews.remove(smc_icons)
+    smc_icon_ids.clear()
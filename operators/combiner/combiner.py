@@ -24,18 +24,25 @@ class Combiner(bpy.types.Operator):
             self.invoke(context, None)
         scn = context.scene
         scn.smc_save_path = self.directory
-        self.structure = BinPacker(get_size(scn, self.structure)).fit()
+        self.structure = get_size(scn, self.structure)
+
+        min_side = get_min_atlas_side(self.structure)
+        if min_side > max_atlas_size:
+            self.report({'ERROR'}, 'The output image size of at least {0}x{0}px is too large'.format(min_side))
+            return {'FINISHED'}
+
+        self.structure = BinPacker(self.structure).fit()
 
         size = get_atlas_size(self.structure)
         atlas_size = calculate_adjusted_size(scn, size)
 
-        if max(atlas_size, default=0) > 20000:
+        if max(atlas_size, default=0) > max_atlas_size:
             self.report({'ERROR'}, 'The output image size of {0}x{1}px is too large'.format(*atlas_size))
             return {'FINISHED'}
 
         atlas = get_atlas(scn, self.structure, atlas_size)
         align_uvs(scn, self.structure, atlas.size, size)
-        comb_mats = get_comb_mats(scn, atlas, self.mats_uv)
+        comb_mats = get_comb_mats(scn, atlas, self.data, self.mats_uv)
         assign_comb_mats(scn, self.data, comb_mats)
         clear_mats(scn, self.mats_uv)
         bpy.ops.smc.refresh_ob_data()
@@ -4,6 +4,7 @@ import math
 import os
 import random
 import re
+from collections import Counter
 from collections import OrderedDict
 from collections import defaultdict
 from itertools import chain
@@ -35,8 +36,12 @@ from ...utils.materials import get_shader_type
 from ...utils.materials import shader_image_nodes
 from ...utils.materials import sort_materials
 from ...utils.objects import align_uv
-from ...utils.objects import get_polys
+from ...utils.objects import get_loops_by_material
+from ...utils.objects import get_loops_data
+from ...utils.objects import get_material_indices
 from ...utils.objects import get_uv
+from ...utils.objects import set_material_indices
+from ...utils.objects import set_uv
 from ...utils.textures import get_texture
 
 try:
@@ -47,11 +52,6 @@ except ImportError:
     Image = None
     ImageType = None
 
-try:
-    from PIL import ImageChops
-except ImportError:
-    ImageChops = None
-
 try:
     from PIL import ImageFile
 except ImportError:
@@ -70,6 +70,7 @@ if ImageFile:
 atlas_prefix = 'Atlas_'
 atlas_texture_prefix = 'texture_atlas_'
 atlas_material_prefix = 'material_atlas_'
+max_atlas_size = 20000
 
 
 def set_ob_mode(scn: Scene, data: SMCObData) -> None:
@@ -80,9 +81,10 @@ def set_ob_mode(scn: Scene, data: SMCObData) -> None:
 
 
 def get_data(data: Sequence[bpy.types.PropertyGroup]) -> SMCObData:
+    cl_material = globs.CL_MATERIAL
     mats = defaultdict(dict)
     for item in data:
-        if item.type == globs.CL_MATERIAL and item.used:
+        if item.type == cl_material and item.used:
             mats[item.ob.name][item.mat] = item.layer
     return mats
 
@@ -91,12 +93,17 @@ def get_mats_uv(scn: Scene, data: SMCObData) -> MatsUV:
     mats_uv = defaultdict(lambda: defaultdict(list))
     for ob_n, item in data.items():
         ob = scn.objects[ob_n]
-        for idx, polys in get_polys(ob).items():
-            mat = ob.data.materials[idx]
-            if mat not in item:
-                continue
-            for poly in polys:
-                mats_uv[ob_n][mat].extend(align_uv(get_uv(ob, poly)))
+        ob_mats = ob.data.materials
+        uv = get_uv(ob)
+        loop_start, loop_total, mat_indices = get_loops_data(ob)
+        used_indices = [idx for idx, mat in enumerate(ob_mats) if mat in item]
+        align_uv(uv, loop_start, loop_total, np.isin(mat_indices, used_indices))
+
+        mat_loops = get_loops_by_material(loop_total, mat_indices)
+        for idx in used_indices:
+            if idx in mat_loops:
+                mats_uv[ob_n][ob_mats[idx]].append(mat_loops[idx])
+        set_uv(ob, uv)
     return mats_uv
 
 
@@ -134,22 +141,22 @@ def get_structure(scn: Scene, data: SMCObData, mats_uv: MatsUV) -> Structure:
             'size': (),
             'uv_size': ()
         },
-        'dup': [],
-        'ob': [],
-        'uv': []
+        'dup': set(),
+        'ob': set(),
+        'uv': defaultdict(list)
     })
 
     for ob_n, item in data.items():
         ob = scn.objects[ob_n]
+        ob_mat_names = {mat.name for mat in ob.data.materials if mat}
         for mat in item:
-            if mat.name not in ob.data.materials:
+            if mat.name not in ob_mat_names:
                 continue
             root_mat = mat.root_mat or mat
-            if mat.root_mat and mat.name not in structure[root_mat]['dup']:
-                structure[root_mat]['dup'].append(mat.name)
-            if ob.name not in structure[root_mat]['ob']:
-                structure[root_mat]['ob'].append(ob.name)
-            structure[root_mat]['uv'].extend(mats_uv[ob_n][mat])
+            if mat.root_mat:
+                structure[root_mat]['dup'].add(mat.name)
+            structure[root_mat]['ob'].add(ob.name)
+            structure[root_mat]['uv'][ob_n].extend(mats_uv[ob_n][mat])
     return structure
 
 
@@ -162,20 +169,24 @@ def clear_duplicates(scn: Scene, data: Structure) -> None:
 
 
 def get_size(scn: Scene, data: Structure) -> Dict:
+    crop = scn.smc_crop
+    gaps = scn.smc_gaps
+    diffuse_size = (scn.smc_diffuse_size + gaps,) * 2
+    uvs = {}
     for mat, item in data.items():
         img = _get_image(mat)
         packed_file = get_packed_file(img)
-        max_x, max_y = _get_max_uv_coordinates(item['uv'])
-        item['gfx']['uv_size'] = (np.clip(max_x, 1, 25), np.clip(max_y, 1, 25))
+        max_x, max_y = _get_max_uv_coordinates([uv[loops] for uv, loops in _get_uv_loops(scn, item, uvs)])
+        item['gfx']['uv_size'] = (float(np.clip(max_x, 1, 25)), float(np.clip(max_y, 1, 25)))
 
-        if not scn.smc_crop:
+        if not crop:
             item['gfx']['uv_size'] = tuple(math.ceil(x) for x in item['gfx']['uv_size'])
 
         if packed_file:
             img_size = _get_image_size(mat, img)
-            item['gfx']['size'] = _calculate_size(img_size, item['gfx']['uv_size'], scn.smc_gaps)
+            item['gfx']['size'] = _calculate_size(img_size, item['gfx']['uv_size'], gaps)
         else:
-            item['gfx']['size'] = (scn.smc_diffuse_size + scn.smc_gaps,) * 2
+            item['gfx']['size'] = diffuse_size
 
     return OrderedDict(sorted(data.items(), key=_size_sorting, reverse=True))
 
@@ -214,15 +225,24 @@ def _get_image_size(mat: bpy.types.Material, img: bpy.types.Image) -> Tuple[int,
     )
 
 
-def _get_max_uv_coordinates(uv_loops: List[bpy.types.MeshUVLoop]) -> Tuple[float, float]:
+def _get_uv_loops(scn: Scene, item: StructureItem, uvs: Dict[str, np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    uv_loops = []
+    for ob_n, loops in item['uv'].items():
+        if not loops:
+            continue
+        if ob_n not in uvs:
+            uvs[ob_n] = get_uv(scn.objects[ob_n])
+        uv_loops.append((uvs[ob_n], np.concatenate(loops)))
+    return uv_loops
+
+
+def _get_max_uv_coordinates(uv_loops: List[np.ndarray]) -> Tuple[float, float]:
     max_x = 1
     max_y = 1
 
     for uv in uv_loops:
-        if not math.isnan(uv.x):
-            max_x = max(max_x, uv.x)
-        if not math.isnan(uv.y):
-            max_y = max(max_y, uv.y)
+        max_x = max(max_x, float(np.fmax.reduce(uv[:, 0], initial=1)))
+        max_y = max(max_y, float(np.fmax.reduce(uv[:, 1], initial=1)))
 
     return max_x, max_y
 
@@ -231,6 +251,18 @@ def _calculate_size(img_size: Tuple[int, int], uv_size: Tuple[int, int], gaps: i
     return cast(Tuple[int, int], tuple(s * uv_s + gaps for s, uv_s in zip(img_size, uv_size)))
 
 
+def get_min_atlas_side(structure: Structure) -> int:
+    max_side = 0
+    area = 0
+
+    for item in structure.values():
+        width, height = item['gfx']['size']
+        max_side = max(max_side, width, height)
+        area += width * height
+
+    return int(max(max_side, math.ceil(math.sqrt(area))))
+
+
 def get_atlas_size(structure: Structure) -> Tuple[int, int]:
     max_x = 1
     max_y = 1
@@ -251,23 +283,31 @@ def calculate_adjusted_size(scn: Scene, size: Tuple[int, int]) -> Tuple[int, int
 
 
 def get_atlas(scn: Scene, data: Structure, atlas_size: Tuple[int, int]) -> ImageType:
-    smc_size = (scn.smc_size_width, scn.smc_size_height)
-    img = Image.new('RGBA', atlas_size)
+    scale, canvas_size = _get_canvas_size(scn, atlas_size)
+    atlas = np.zeros((canvas_size[1], canvas_size[0], 4), dtype=np.uint8)
     half_gaps = int(scn.smc_gaps / 2)
 
     for mat, item in data.items():
         _set_image_or_color(item, mat)
-        _paste_gfx(scn, item, mat, img, half_gaps)
 
-    if scn.smc_size in ['CUST', 'STRICTCUST']:
-        img.thumbnail(smc_size, resampling)
+    images = {}
+    image_uses = _count_image_uses(data)
+    for mat, item in data.items():
+        _paste_gfx(scn, item, mat, atlas, half_gaps, images, image_uses, scale)
 
-    if scn.smc_size == 'STRICTCUST':
-        canvas_img = Image.new('RGBA', smc_size)
-        canvas_img.paste(img)
-        return canvas_img
+    return Image.fromarray(atlas, 'RGBA')
 
-    return img
+
+def _get_canvas_size(scn: Scene, atlas_size: Tuple[int, int]) -> Tuple[float, Tuple[int, int]]:
+    if scn.smc_size not in ['CUST', 'STRICTCUST']:
+        return 1, atlas_size
+
+    smc_size = (scn.smc_size_width, scn.smc_size_height)
+    scale = min(1, *(s / atlas_s for s, atlas_s in zip(smc_size, atlas_size)))
+
+    if scn.smc_size == 'STRICTCUST':
+        return scale, smc_size
+    return scale, cast(Tuple[int, int], tuple(max(1, round(x * scale)) for x in atlas_size))
 
 
 def _set_image_or_color(item: StructureItem, mat: bpy.types.Material) -> None:
@@ -282,53 +322,115 @@ def _set_image_or_color(item: StructureItem, mat: bpy.types.Material) -> None:
         item['gfx']['img_or_color'] = get_diffuse(mat)
 
 
-def _paste_gfx(scn: Scene, item: StructureItem, mat: bpy.types.Material, img: ImageType, half_gaps: int) -> None:
+def _count_image_uses(data: Structure) -> Counter:
+    return Counter(
+        _get_image_key(mat, item['gfx']['img_or_color'])
+        for mat, item in data.items()
+        if item['gfx']['fit'] and isinstance(item['gfx']['img_or_color'], bpy.types.PackedFile)
+    )
+
+
+def _get_image_key(mat: bpy.types.Material, packed_file: bpy.types.PackedFile) -> Tuple:
+    return packed_file, (mat.smc_size_width, mat.smc_size_height) if mat.smc_size else None
+
+
+def _paste_gfx(scn: Scene, item: StructureItem, mat: bpy.types.Material, atlas: np.ndarray, half_gaps: int,
+               images: Dict[Tuple, ImageType], image_uses: Counter, scale: float) -> None:
     if not item['gfx']['fit']:
         return
 
-    img.paste(
-        _get_gfx(scn, mat, item, item['gfx']['img_or_color']),
-        (int(item['gfx']['fit']['x'] + half_gaps), int(item['gfx']['fit']['y'] + half_gaps))
-    )
+    img_or_color = item['gfx']['img_or_color']
+    x = int(item['gfx']['fit']['x'] + half_gaps)
+    y = int(item['gfx']['fit']['y'] + half_gaps)
 
+    if isinstance(img_or_color, bpy.types.PackedFile):
+        gfx = _get_gfx(scn, mat, item, img_or_color, images, image_uses)
+        width, height = gfx.size
+    else:
+        gfx = None
+        width, height = (int(size - scn.smc_gaps) for size in item['gfx']['size'])
+
+    if scale < 1:
+        left, top = round(x * scale), round(y * scale)
+        width, height = round((x + width) * scale) - left, round((y + height) * scale) - top
+        if not width or not height:
+            return
+        if gfx is not None:
+            gfx = gfx.resize((width, height), _choose_resampling(1 / scale))
+        x, y = left, top
+
+    atlas_height, atlas_width = atlas.shape[:2]
+    width = min(width, max(atlas_width - x, 0))
+    height = min(height, max(atlas_height - y, 0))
+
+    if gfx is None:
+        atlas[y:y + height, x:x + width] = _to_rgba(img_or_color) if img_or_color else (1, 1, 1, 1)
+        return
 
-def _get_gfx(scn: Scene, mat: bpy.types.Material, item: StructureItem,
-             img_or_color: Union[bpy.types.PackedFile, Tuple, None]) -> ImageType:
-    size = cast(Tuple[int, int], tuple(int(size - scn.smc_gaps) for size in item['gfx']['size']))
+    if gfx.mode != 'RGBA':
+        gfx = gfx.convert('RGBA')
+    atlas[y:y + height, x:x + width] = np.asarray(gfx)[:height, :width]
 
-    if not img_or_color:
-        return Image.new('RGBA', size, (1, 1, 1, 1))
 
-    if isinstance(img_or_color, tuple):
-        return Image.new('RGBA', size, img_or_color)
+def _get_gfx(scn: Scene, mat: bpy.types.Material, item: StructureItem, packed_file: bpy.types.PackedFile,
+             images: Dict[Tuple, ImageType], image_uses: Counter) -> ImageType:
+    size = cast(Tuple[int, int], tuple(int(size - scn.smc_gaps) for size in item['gfx']['size']))
 
-    img = Image.open(io.BytesIO(img_or_color.data))
-    if img.size != size:
-        img.resize(size, resampling)
-    if mat.smc_size:
-        img.thumbnail((mat.smc_size_width, mat.smc_size_height), resampling)
+    img = _open_image(_get_image_key(mat, packed_file), images, image_uses)
+    if mat.smc_diffuse:
+        img = _multiply_diffuse(img, get_diffuse(mat))
     if max(item['gfx']['uv_size'], default=0) > 1:
         img = _get_uv_image(item, img, size)
-    if mat.smc_diffuse:
-        diffuse_img = Image.new(img.mode, size, get_diffuse(mat))
-        img = ImageChops.multiply(img, diffuse_img)
 
     return img
 
 
+def _open_image(key: Tuple, images: Dict[Tuple, ImageType], image_uses: Counter) -> ImageType:
+    img = images.pop(key, None)
+    if img is None:
+        packed_file, thumbnail_size = key
+        img = Image.open(io.BytesIO(packed_file.data))
+        if thumbnail_size:
+            img.draft(img.mode, thumbnail_size)
+            ratio = max(s / t for s, t in zip(img.size, thumbnail_size))
+            img.thumbnail(thumbnail_size, _choose_resampling(ratio))
+
+    image_uses[key] -= 1
+    if image_uses[key] <= 0:
+        return img
+
+    images[key] = img
+    return img.copy()
+
+
+def _choose_resampling(ratio: float) -> int:
+    if ratio >= 2:
+        return Image.BOX
+    elif ratio > 1:
+        return Image.BILINEAR
+    return resampling
+
+
 def _get_uv_image(item: StructureItem, img: ImageType, size: Tuple[int, int]) -> ImageType:
-    uv_img = Image.new('RGBA', size)
-    size_height = size[1]
-    img_width, img_height = img.size
+    size_width, size_height = size
     uv_width, uv_height = (math.ceil(x) for x in item['gfx']['uv_size'])
 
-    for h in range(uv_height):
-        y = size_height - img_height - h * img_height
-        for w in range(uv_width):
-            x = w * img_width
-            uv_img.paste(img, (x, y))
+    tiles = np.tile(np.asarray(img.convert('RGBA')), (uv_height, uv_width, 1))[-size_height:, :size_width]
+    uv_img = np.zeros((size_height, size_width, 4), dtype=np.uint8)
+    uv_img[size_height - tiles.shape[0]:, :tiles.shape[1]] = tiles
+
+    return Image.fromarray(uv_img, 'RGBA')
+
 
-    return uv_img
+def _to_rgba(diffuse: Diffuse) -> Tuple[int, int, int, int]:
+    return cast(Tuple[int, int, int, int], tuple(int(x) for x in diffuse) + (255,) * (4 - len(diffuse)))
+
+
+def _multiply_diffuse(img: ImageType, diffuse: Diffuse) -> ImageType:
+    diffuse = _to_rgba(diffuse)
+    if diffuse == (255, 255, 255, 255):
+        return img
+    return img.convert('RGBA').point([value * channel // 255 for channel in diffuse for value in range(256)])
 
 
 def align_uvs(scn: Scene, data: Structure, atlas_size: Tuple[int, int], size: Tuple[int, int]) -> None:
@@ -339,6 +441,7 @@ def align_uvs(scn: Scene, data: Structure, atlas_size: Tuple[int, int], size: Tu
     margin = scn.smc_gaps + (0 if scn.smc_pixel_art else 2)
     border_margin = int(scn.smc_gaps / 2) + (0 if scn.smc_pixel_art else 1)
 
+    uvs = {}
     for item in data.values():
         gfx_size = item['gfx']['size']
         gfx_height = gfx_size[1]
@@ -350,15 +453,22 @@ def align_uvs(scn: Scene, data: Structure, atlas_size: Tuple[int, int], size: Tu
         x_offset = item['gfx']['fit']['x'] + border_margin
         y_offset = item['gfx']['fit']['y'] - border_margin
 
-        for uv in item['uv']:
-            reset_x = uv.x / uv_width * gfx_width_margin
-            reset_y = uv.y / uv_height * gfx_height_margin - gfx_height
+        scale = np.array([
+            gfx_width_margin / uv_width / size_width * scaled_width,
+            gfx_height_margin / uv_height / size_height * scaled_height,
+        ])
+        offset = np.array([
+            x_offset / size_width * scaled_width,
+            (-gfx_height - y_offset) / size_height * scaled_height + 1,
+        ])
+        if np.all(scale == 1) and not np.any(offset):
+            continue
 
-            uv_x = (reset_x + x_offset) / size_width
-            uv_y = (reset_y - y_offset) / size_height
+        for uv, loops in _get_uv_loops(scn, item, uvs):
+            uv[loops] = uv[loops] * scale + offset
 
-            uv.x = uv_x * scaled_width
-            uv.y = uv_y * scaled_height + 1
+    for ob_n, uv in uvs.items():
+        set_uv(scn.objects[ob_n], uv)
 
 
 def _get_scale_factors(atlas_size: Tuple[int, int], size: Tuple[int, int]) -> Tuple[float, float]:
@@ -374,19 +484,20 @@ def _get_scale_factors(atlas_size: Tuple[int, int], size: Tuple[int, int]) -> Tu
     return (1, 1 / aspect_ratio) if aspect_ratio > 1 else (aspect_ratio, 1)
 
 
-def get_comb_mats(scn: Scene, atlas: ImageType, mats_uv: MatsUV) -> CombMats:
+def get_comb_mats(scn: Scene, atlas: ImageType, data: SMCObData, mats_uv: MatsUV) -> CombMats:
     unique_id = _get_unique_id(scn)
-    layers = _get_layers(scn, mats_uv)
+    layers = _get_layers(data, mats_uv)
     path = _save_atlas(scn, atlas, unique_id)
     texture = _create_texture(path, unique_id)
     return cast(CombMats, {idx: _create_material(texture, unique_id, idx) for idx in layers})
 
 
-def _get_layers(scn: Scene, mats_uv: MatsUV) -> Set[int]:
+def _get_layers(data: SMCObData, mats_uv: MatsUV) -> Set[int]:
     return {
-        item.layer
-        for item in scn.smc_ob_data
-        if item.type == globs.CL_MATERIAL and item.used and item.mat in mats_uv[item.ob.name]
+        layer
+        for ob_n, item in data.items()
+        for mat, layer in item.items()
+        if mat in mats_uv[ob_n]
     }
 
 
@@ -404,8 +515,9 @@ def _get_unique_id(scn: Scene) -> str:
 
 def _add_its_from_existing_materials(scn: Scene, existed_ids: Set[int]) -> None:
     atlas_material_pattern = re.compile(r'{0}(\d+)_\d+'.format(atlas_material_prefix))
+    cl_material = globs.CL_MATERIAL
     for item in scn.smc_ob_data:
-        if item.type != globs.CL_MATERIAL:
+        if item.type != cl_material:
             continue
         
         match = atlas_material_pattern.fullmatch(item.mat.name)
@@ -414,6 +526,11 @@ def _add_its_from_existing_materials(scn: Scene, existed_ids: Set[int]) -> None:
 
 
 def _generate_random_unique_id(existed_ids: Set[int]) -> str:
+    for _ in range(100):
+        unique_id = random.randrange(10000, 99999)
+        if unique_id not in existed_ids:
+            return str(unique_id)
+
     unused_ids = set(range(10000, 99999)) - existed_ids
     return str(random.choice(list(unused_ids)))
 
@@ -490,14 +607,17 @@ def _assign_mats(item: SMCObDataItem, comb_mats: CombMats, ob_materials: ObMats)
 
 
 def _assign_mats_to_polys(item: SMCObDataItem, comb_mats: CombMats, ob: bpy.types.Object, ob_materials: ObMats) -> None:
-    for idx, polys in get_polys(ob).items():
-        if ob_materials[idx] not in item:
-            continue
-        
-        mat_name = comb_mats[item[ob_materials[idx]]].name
-        mat_idx = ob_materials.find(mat_name)
-        for poly in polys:
-            poly.material_index = mat_idx
+    mat_indices = {}
+    for mat_idx, mat in enumerate(ob_materials):
+        if mat:
+            mat_indices.setdefault(mat.name, mat_idx)
+
+    poly_mat_indices = get_material_indices(ob)
+    remap = np.arange(max(len(ob_materials), poly_mat_indices.max(initial=-1) + 1), dtype=np.int32)
+    for idx in np.unique(poly_mat_indices).tolist():
+        if idx < len(ob_materials) and ob_materials[idx] in item:
+            remap[idx] = mat_indices[comb_mats[item[ob_materials[idx]]].name]
+    set_material_indices(ob, remap[poly_mat_indices])
 
 
 def clear_mats(scn: Scene, mats_uv: MatsUV) -> None:
@@ -35,18 +35,25 @@ class BinPacker(object):
 
         self.root['w'], self.root['h'] = next(iter(self.bin.values()))['gfx']['size']
 
+        find_node = self.find_node
         for img in self.bin.values():
-            w, h = img['gfx']['size']
-            node = self.find_node(self.root, w, h)
-            img['gfx']['fit'] = self.split_node(node, w, h) if node else self.grow_node(w, h)
+            gfx = img['gfx']
+            w, h = gfx['size']
+            node = find_node(self.root, w, h)
+            gfx['fit'] = self.split_node(node, w, h) if node else self.grow_node(w, h)
 
         return self.bin
 
-    def find_node(self, root: Dict, w: int, h: int) -> Union[Dict, None]:
-        if 'used' in root and root['used']:
-            return self.find_node(root['right'], w, h) or self.find_node(root['down'], w, h)
-        elif w <= root['w'] and h <= root['h']:
-            return root
+    @staticmethod
+    def find_node(root: Dict, w: int, h: int) -> Union[Dict, None]:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.get('used'):
+                stack.append(node['down'])
+                stack.append(node['right'])
+            elif w <= node['w'] and h <= node['h']:
+                return node
         return None
 
     @staticmethod
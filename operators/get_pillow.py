@@ -1,12 +1,15 @@
 import os
 import subprocess
 import sys
+from importlib.util import find_spec
 from typing import Set
 
 import bpy
 
 from .. import globs
 
+get_pip_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'get-pip.py')
+
 
 class InstallPIL(bpy.types.Operator):
     bl_idname = 'smc.get_pillow'
@@ -14,15 +17,11 @@ class InstallPIL(bpy.types.Operator):
     bl_description = 'Click to install Pillow. This could take a while and might require you to run Blender as Admin.'
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
-        try:
-            from pip import _internal
-            try:
-                from PIL import Image, ImageChops
-            except ImportError:
-                self._install_pillow()
-        except ImportError:
+        if not find_spec('pip'):
             self._install_pip()
             self._install_pillow()
+        elif not find_spec('PIL'):
+            self._install_pillow()
 
         globs.smc_pi = True
 
@@ -39,14 +38,14 @@ class InstallPIL(bpy.types.Operator):
         else:
             self._install_pip_clean()
 
-    @staticmethod
-    def _install_pip_clean() -> None:
-        python_executable = sys.executable if globs.is_blender_2_92_or_newer else bpy.app.binary_path_python
-        get_pip = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'get-pip.py')
-        subprocess.call([python_executable, get_pip, '--user', '--force-reinstall'], shell=True)
+    def _install_pip_clean(self) -> None:
+        subprocess.call([self._get_python_executable(), get_pip_path, '--user', '--force-reinstall'])
+
+    def _install_pillow(self) -> None:
+        subprocess.call([
+            self._get_python_executable(), '-m', 'pip', 'install', '-U', 'pip', 'setuptools', 'wheel', 'Pillow', '--user'
+        ])
 
     @staticmethod
-    def _install_pillow() -> None:
-        from pip import _internal
-        _internal.main(['install', 'pip', 'setuptools', 'wheel', '-U', '--user'])
-        _internal.main(['install', 'Pillow', '--user'])
+    def _get_python_executable() -> str:
+        return sys.executable if globs.is_blender_2_92_or_newer else bpy.app.binary_path_python
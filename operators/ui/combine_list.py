@@ -1,91 +1,121 @@
-from collections import defaultdict
+from collections import OrderedDict
+from collections import deque
+from functools import partial
+from types import MappingProxyType
+from typing import Deque
 from typing import List
+from typing import Optional
 from typing import Set
-from typing import cast
 
 import bpy
 from bpy.props import *
 
 from ... import globs
 from ...type_annotations import CombineListData
+from ...type_annotations import CombineListRow
 from ...type_annotations import Scene
 from ...utils.materials import get_materials
 
+preview_batch_size = 8
+default_ob_state = (True, MappingProxyType({}))
+default_mat_state = (True, 1)
+
 
 class RefreshObData(bpy.types.Operator):
     bl_idname = 'smc.refresh_ob_data'
     bl_label = 'Combine List'
     bl_description = 'Updates the material list'
 
-    @staticmethod
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
-        ob_list = [ob for ob in context.visible_objects if
-                   ob.type == 'MESH' and ob.data.uv_layers.active and ob.data.materials]
+        ob_list = [ob for ob in context.visible_objects if self._is_combinable(ob)]
         combine_list_data = self._cache_previous_values(scn)
         self._rebuild_items_list(scn, ob_list, combine_list_data)
         return {'FINISHED'}
 
+    @staticmethod
+    def _is_combinable(ob: bpy.types.Object) -> bool:
+        if ob.type != 'MESH':
+            return False
+
+        mesh = ob.data
+        return bool(mesh.materials) and bool(mesh.uv_layers.active)
+
     @staticmethod
     def _cache_previous_values(scn: Scene) -> CombineListData:
-        combine_list_data = cast(CombineListData, defaultdict(lambda: {
-            'used': True,
-            'mats': defaultdict(lambda: {
-                'used': True,
-                'layer': 1,
-            }),
-        }))
+        cl_object = globs.CL_OBJECT
+        cl_material = globs.CL_MATERIAL
+        combine_list_data = {}
 
         for item in scn.smc_ob_data:
-            if item.type == globs.CL_OBJECT:
-                combine_list_data[item.ob]['used'] = item.used
-            elif item.type == globs.CL_MATERIAL:
-                mat_data = combine_list_data[item.ob]['mats'][item.mat]
-                mat_data.update({'used': item.used, 'layer': item.layer})
+            item_type = item.type
+            if item_type == cl_object:
+                ob = item.ob
+                combine_list_data[ob] = (item.used, combine_list_data.get(ob, (True, {}))[1])
+            elif item_type == cl_material:
+                combine_list_data.setdefault(item.ob, (True, {}))[1][item.mat] = (item.used, item.layer)
         return combine_list_data
 
-    def _rebuild_items_list(self, scn: Scene, ob_list: Set[bpy.types.Object],
+    def _rebuild_items_list(self, scn: Scene, ob_list: List[bpy.types.Object],
                             combine_list_data: CombineListData) -> None:
-        scn.smc_ob_data.clear()
+        rows = self._get_rows(ob_list, combine_list_data)
+        data = scn.smc_ob_data
+        for idx in range(len(data) - 1, len(rows) - 1, -1):
+            data.remove(idx)
+        if not rows:
+            return
 
-        for ob_id, ob in enumerate(ob_list):
-            ob_data = combine_list_data[ob]
-            ob_used = ob_data['used']
-            self._create_ob_item(scn, ob, ob_id, ob_used)
+        for _ in range(len(rows) - len(data)):
+            data.add()
+        for item, (_, ob, _, mat, _, _) in zip(data, rows):
+            if item.ob != ob:
+                item.ob = ob
+            if item.mat != mat:
+                item.mat = mat
+
+        item_types, _, ob_ids, _, used, layers = zip(*rows)
+        data.foreach_set('type', item_types)
+        data.foreach_set('ob_id', ob_ids)
+        data.foreach_set('used', used)
+        data.foreach_set('layer', layers)
+
+        if globs.is_blender_3_or_newer:
+            cl_material = globs.CL_MATERIAL
+            missing_previews = [
+                mat
+                for mat in OrderedDict.fromkeys(mat for item_type, _, _, mat, _, _ in rows if item_type == cl_material)
+                if not mat.preview
+            ]
+            if missing_previews:
+                bpy.app.timers.register(partial(_ensure_previews, deque(missing_previews)), first_interval=0)
 
-            for mat in get_materials(ob):
-                if globs.is_blender_3_or_newer and not mat.preview:
-                    mat.preview_ensure()
+    @staticmethod
+    def _get_rows(ob_list: List[bpy.types.Object], combine_list_data: CombineListData) -> List[CombineListRow]:
+        cl_object = globs.CL_OBJECT
+        cl_material = globs.CL_MATERIAL
+        cl_separator = globs.CL_SEPARATOR
+        rows = []
 
-                mat_data = ob_data['mats'][mat]
-                mat_used = ob_used and mat_data['used']
-                mat_layer = mat_data['layer']
-                self._create_mat_item(scn, ob, ob_id, mat, mat_used, mat_layer)
-            self._create_separator_item(scn)
+        for ob_id, ob in enumerate(ob_list):
+            ob_used, mats_data = combine_list_data.get(ob, default_ob_state)
+            rows.append((cl_object, ob, ob_id, None, ob_used, 1))
 
-    @staticmethod
-    def _create_ob_item(scn: Scene, ob: bpy.types.Object, ob_id: int, used: bool) -> None:
-        item = scn.smc_ob_data.add()
-        item.ob = ob
-        item.ob_id = ob_id
-        item.type = 0
-        item.used = used
+            for mat in get_materials(ob):
+                mat_used, mat_layer = mats_data.get(mat, default_mat_state)
+                rows.append((cl_material, ob, ob_id, mat, ob_used and mat_used, mat_layer))
+            rows.append((cl_separator, None, 0, None, True, 1))
+        return rows
 
-    @staticmethod
-    def _create_mat_item(scn: Scene, ob: bpy.types.Object, ob_id: int, mat: bpy.types.Material, used: bool,
-                         layer: int) -> None:
-        item = scn.smc_ob_data.add()
-        item.ob = ob
-        item.ob_id = ob_id
-        item.mat = mat
-        item.type = 1
-        item.used = used
-        item.layer = layer
 
-    @staticmethod
-    def _create_separator_item(scn: Scene) -> None:
-        item = scn.smc_ob_data.add()
-        item.type = 2
+def _ensure_previews(mats: Deque[bpy.types.Material]) -> Optional[float]:
+    for _ in range(min(len(mats), preview_batch_size)):
+        mat = mats.popleft()
+        try:
+            if not mat.preview:
+                mat.preview_ensure()
+        except ReferenceError:
+            pass
+    return 0 if mats else None
 
 
 class CombineSwitch(bpy.types.Operator):
@@ -100,27 +130,44 @@ class CombineSwitch(bpy.types.Operator):
         data = scn.smc_ob_data
         item = data[self.list_id]
         if item.type == globs.CL_OBJECT:
-            self._switch_ob_state(data, item)
+            self._switch_ob_state(data, self.list_id)
         elif item.type == globs.CL_MATERIAL:
-            self._switch_mat_state(data, item)
+            self._switch_mat_state(data, self.list_id)
         return {'FINISHED'}
 
     @staticmethod
-    def _switch_ob_state(data: List[bpy.types.PropertyGroup], item: bpy.types.PropertyGroup) -> None:
-        mat_list = [mat for mat in data if mat.ob_id == item.ob_id and mat.type == globs.CL_MATERIAL]
+    def _switch_ob_state(data: List[bpy.types.PropertyGroup], ob_idx: int) -> None:
+        cl_material = globs.CL_MATERIAL
+        mat_list = []
+        for idx in range(ob_idx + 1, len(data)):
+            mat = data[idx]
+            if mat.type != cl_material:
+                break
+            mat_list.append(mat)
+
         if not mat_list:
             return
 
-        item.used = not item.used
+        new_state = not data[ob_idx].used
+        data[ob_idx].used = new_state
         for mat in mat_list:
-            mat.used = item.used
+            if mat.used != new_state:
+                mat.used = new_state
 
     @staticmethod
-    def _switch_mat_state(data: List[bpy.types.PropertyGroup], item: bpy.types.PropertyGroup) -> None:
-        ob = next((ob for ob in data if ob.ob_id == item.ob_id and ob.type == globs.CL_OBJECT), None)
+    def _switch_mat_state(data: List[bpy.types.PropertyGroup], mat_idx: int) -> None:
+        cl_material = globs.CL_MATERIAL
+        ob = None
+        for idx in range(mat_idx - 1, -1, -1):
+            item_type = data[idx].type
+            if item_type != cl_material:
+                ob = data[idx] if item_type == globs.CL_OBJECT else None
+                break
+
         if not ob:
             return
 
+        item = data[mat_idx]
         if not item.used:
             ob.used = True
         item.used = not item.used
@@ -9,18 +9,11 @@ from ...ui.main_menu import MaterialMenu
 def draw_ui(context: bpy.types.Context, m_col: bpy.types.UILayout) -> None:
     if globs.pil_exist:
         _materials_list(context.scene, m_col)
-    elif globs.smc_pi:
-        col = m_col.box().column()
-        col.label(text='Installation complete', icon_value=get_icon_id('done'))
-        col.label(text='Please restart Blender', icon_value=get_icon_id('null'))
     else:
-        MaterialMenu.pillow_installator(m_col)
+        MaterialMenu.pillow_state(m_col)
 
 
 def _materials_list(scn: Scene, m_col: bpy.types.UILayout) -> None:
-    patreon = 'https://www.patreon.com/shotariya'
-    buymeacoffee = 'https://buymeacoffee.com/shotariya'
-
     if scn.smc_ob_data:
         m_col.template_list('SMC_UL_Combine_List', 'combine_list', scn, 'smc_ob_data',
                             scn, 'smc_ob_data_id', rows=12, type='DEFAULT')
@@ -35,5 +28,6 @@ def _materials_list(scn: Scene, m_col: bpy.types.UILayout) -> None:
     col.separator()
     col = m_col.column()
     col.label(text='If this saved you time:')
-    col.operator('smc.browser', text='Support Material Combiner', icon_value=get_icon_id('patreon')).link = patreon
-    col.operator('smc.browser', text='Buy Me a Coffee', icon_value=get_icon_id('bmc')).link = buymeacoffee
+    col.operator('smc.browser', text='Support Material Combiner',
+                 icon_value=get_icon_id('patreon')).link = globs.PATREON_URL
+    col.operator('smc.browser', text='Buy Me a Coffee', icon_value=get_icon_id('bmc')).link = globs.BUYMEACOFFEE_URL
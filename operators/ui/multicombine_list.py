@@ -4,6 +4,8 @@ from typing import Set
 import bpy
 from bpy.props import *
 
+image_filter_glob = '*.BMP;*.GIF;*.JPEG;*.JPG;*.PNG;*.TIFF;*.TIF;*.DDS;*.PSD;*.TGA'
+
 
 class MultiCombineImageAdd(bpy.types.Operator):
     bl_idname = 'smc.img_add'
@@ -11,12 +13,12 @@ class MultiCombineImageAdd(bpy.types.Operator):
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
-        item = scn.smc_ob_data[scn.smc_list_id]
-        m_item = item.mat.smc_multi_list.add()
+        mat = scn.smc_ob_data[scn.smc_list_id].mat
+        m_item = mat.smc_multi_list.add()
         m_item.img_name = 'Empty'
         m_item.img_path = ''
         m_item.img_type = 0
-        item.mat.smc_multi_list_id = len(item.mat.smc_multi_list) - 1
+        mat.smc_multi_list_id = len(mat.smc_multi_list) - 1
         return {'FINISHED'}
 
 
@@ -26,11 +28,15 @@ class MultiCombineImageRemove(bpy.types.Operator):
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
-        item = scn.smc_ob_data[scn.smc_list_id]
-        if len(item.mat.smc_multi_list) > 0:
-            item.mat.smc_multi_list.remove(item.mat.smc_multi_list_id)
-        if item.mat.smc_multi_list_id > (len(item.mat.smc_multi_list) - 1):
-            item.mat.smc_multi_list_id = item.mat.smc_multi_list_id - 1
+        mat = scn.smc_ob_data[scn.smc_list_id].mat
+        multi_list = mat.smc_multi_list
+        if not multi_list:
+            return {'FINISHED'}
+
+        multi_list.remove(mat.smc_multi_list_id)
+        last_id = max(len(multi_list) - 1, 0)
+        if mat.smc_multi_list_id > last_id:
+            mat.smc_multi_list_id = last_id
         return {'FINISHED'}
 
 
@@ -42,15 +48,13 @@ class MultiCombineImageMove(bpy.types.Operator):
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
-        item = scn.smc_ob_data[scn.smc_list_id]
-        if self.type == 'UP':
-            item.mat.smc_multi_list.move(item.mat.smc_multi_list_id, item.mat.smc_multi_list_id - 1)
-            if item.mat.smc_multi_list_id >= 1:
-                item.mat.smc_multi_list_id = item.mat.smc_multi_list_id - 1
-        elif self.type == 'DOWN':
-            item.mat.smc_multi_list.move(item.mat.smc_multi_list_id, item.mat.smc_multi_list_id + 1)
-            if (item.mat.smc_multi_list_id + 1) != len(item.mat.smc_multi_list):
-                item.mat.smc_multi_list_id = item.mat.smc_multi_list_id + 1
+        mat = scn.smc_ob_data[scn.smc_list_id].mat
+        multi_list = mat.smc_multi_list
+        cur_id = mat.smc_multi_list_id
+        new_id = cur_id - 1 if self.type == 'UP' else cur_id + 1
+        if 0 <= new_id < len(multi_list):
+            multi_list.move(cur_id, new_id)
+            mat.smc_multi_list_id = new_id
         return {'FINISHED'}
 
 
@@ -65,9 +69,10 @@ class MultiCombineImageReset(bpy.types.Operator):
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
         item = scn.smc_ob_data[scn.smc_list_id]
-        item.mat.smc_multi_list[self.list_id].img_name = 'Empty'
-        item.mat.smc_multi_list[self.list_id].img_path = ''
-        item.mat.smc_multi_list[self.list_id].img_type = 0
+        m_item = item.mat.smc_multi_list[self.list_id]
+        m_item.img_name = 'Empty'
+        m_item.img_path = ''
+        m_item.img_type = 0
         return {'FINISHED'}
 
 
@@ -82,10 +87,11 @@ class MultiCombineColor(bpy.types.Operator):
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
         item = scn.smc_ob_data[scn.smc_list_id]
-        item.mat.smc_multi_list[self.list_id].img_name = 'Color'
-        item.mat.smc_multi_list[self.list_id].img_alpha_color = (1.0, 1.0, 1.0, 1.0)
-        item.mat.smc_multi_list[self.list_id].img_path = ''
-        item.mat.smc_multi_list[self.list_id].img_type = 2
+        m_item = item.mat.smc_multi_list[self.list_id]
+        m_item.img_name = 'Color'
+        m_item.img_alpha_color = (1.0, 1.0, 1.0, 1.0)
+        m_item.img_path = ''
+        m_item.img_type = 2
         return {'FINISHED'}
 
 
@@ -99,20 +105,16 @@ class MultiCombineImagePath(bpy.types.Operator):
     filepath = StringProperty(name='Select an Image', maxlen=1024, options={'HIDDEN'})
     filename = StringProperty(name='Image Name', default='', options={'HIDDEN'})
     directory = StringProperty(maxlen=1024, default='', subtype='FILE_PATH', options={'HIDDEN'})
-    filter_glob = StringProperty(
-        default='*.BMP;*.GIF;*.JPEG;*.JPG;*.PNG;*.TIFF;*.TIF;*.DDS;*.PSD;*.TGA',
-        options={'HIDDEN'}
-    )
+    filter_glob = StringProperty(default=image_filter_glob, options={'HIDDEN'})
 
     def execute(self, context: bpy.types.Context) -> Set[str]:
         scn = context.scene
         item = scn.smc_ob_data[scn.smc_list_id]
-        name = self.filename
-        path = os.path.join(self.directory, self.filename)
-        item.mat.smc_multi_list[self.list_id].img_name = name.split('.')[0]
-        item.mat.smc_multi_list[self.list_id].img_path = path
-        item.mat.smc_multi_list[self.list_id].img_color = (1.0, 1.0, 1.0)
-        item.mat.smc_multi_list[self.list_id].img_type = 1
+        m_item = item.mat.smc_multi_list[self.list_id]
+        m_item.img_name = os.path.splitext(self.filename)[0]
+        m_item.img_path = os.path.join(self.directory, self.filename)
+        m_item.img_color = (1.0, 1.0, 1.0)
+        m_item.img_type = 1
         bpy.ops.smc.property_menu('INVOKE_DEFAULT', list_id=scn.smc_list_id)
         return {'FINISHED'}
 
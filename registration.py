@@ -13,7 +13,30 @@ from .icons import initialize_smc_icons
 from .icons import unload_smc_icons
 from .type_annotations import BlClasses
 
-__bl_classes = [
+bl_property_type = bpy.props._PropertyDeferred if bpy.app.version >= (2, 93, 0) else tuple
+
+
+def make_annotations(cls: BlClasses) -> BlClasses:
+    if globs.is_blender_2_79_or_older or cls.__dict__.get('_smc_annotated'):
+        return cls
+
+    bl_props = {k: v for k, v in cls.__dict__.items() if isinstance(v, bl_property_type)}
+
+    if bl_props:
+        if '__annotations__' not in cls.__dict__:
+            setattr(cls, '__annotations__', {})
+
+        annotations = cls.__dict__['__annotations__']
+
+        for k, v in bl_props.items():
+            annotations[k] = v
+            delattr(cls, k)
+
+    cls._smc_annotated = True
+    return cls
+
+
+__bl_classes = tuple(make_annotations(cls) for cls in (
     ui.credits_menu.CreditsMenu,
     ui.main_menu.MaterialMenu,
     ui.property_menu.PropertyMenu,
@@ -35,7 +58,7 @@ __bl_classes = [
     extend_types.UpdatePreferences,
 
     extend_lists.SMC_UL_Combine_List,
-]
+))
 
 
 def register_all(bl_info: Dict[str, Union[str, tuple]]) -> None:
@@ -56,7 +79,9 @@ def unregister_all() -> None:
 def _register_classes() -> None:
     count = 0
     for cls in __bl_classes:
-        make_annotations(cls)
+        if getattr(cls, 'is_registered', False):
+            continue
+
         try:
             bpy.utils.register_class(cls)
             count += 1
@@ -76,25 +101,3 @@ def _unregister_classes() -> None:
         except (ValueError, RuntimeError) as e:
             print('Error:', cls, e)
     print('Unregistered', count, 'Material Combiner classes.')
-
-
-def make_annotations(cls: BlClasses) -> BlClasses:
-    if globs.is_blender_2_79_or_older:
-        return cls
-
-    if bpy.app.version >= (2, 93, 0):
-        bl_props = {k: v for k, v in cls.__dict__.items() if isinstance(v, bpy.props._PropertyDeferred)}
-    else:
-        bl_props = {k: v for k, v in cls.__dict__.items() if isinstance(v, tuple)}
-
-    if bl_props:
-        if '__annotations__' not in cls.__dict__:
-            setattr(cls, '__annotations__', {})
-
-        annotations = cls.__dict__['__annotations__']
-
-        for k, v in bl_props.items():
-            annotations[k] = v
-            delattr(cls, k)
-
-    return cls
@@ -0,0 +1,91 @@
+import importlib
+import importlib.util
+import os
+import sys
+
+import pytest
+
+bpy = pytest.importorskip('bpy')
+
+addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_combiner_ops():
+    if 'material_combiner' not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            'material_combiner', os.path.join(addon_dir, '__init__.py'), submodule_search_locations=[addon_dir]
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['material_combiner'] = module
+        spec.loader.exec_module(module)
+    return importlib.import_module('material_combiner.operators.combiner.combiner_ops')
+
+
+combiner_ops = _import_combiner_ops()
+
+
+@pytest.fixture
+def blend_data():
+    created = []
+    yield created
+    for datablock in reversed(created):
+        if isinstance(datablock, bpy.types.Object):
+            bpy.data.objects.remove(datablock)
+        elif isinstance(datablock, bpy.types.Mesh):
+            bpy.data.meshes.remove(datablock)
+        else:
+            bpy.data.materials.remove(datablock)
+
+
+def _new_material(blend_data, name):
+    mat = bpy.data.materials.new(name)
+    blend_data.append(mat)
+    return mat
+
+
+def _new_object(blend_data, materials, poly_mat_indices):
+    mesh = bpy.data.meshes.new('smc_test_mesh')
+    verts = [(idx, idx % 3, 0) for idx in range(len(poly_mat_indices) * 3)]
+    faces = [(idx * 3, idx * 3 + 1, idx * 3 + 2) for idx in range(len(poly_mat_indices))]
+    mesh.from_pydata(verts, [], faces)
+    for mat in materials:
+        mesh.materials.append(mat)
+    mesh.polygons.foreach_set('material_index', poly_mat_indices)
+    ob = bpy.data.objects.new('smc_test_ob', mesh)
+    blend_data.extend((mesh, ob))
+    return ob
+
+
+def _poly_mat_indices(ob):
+    return [poly.material_index for poly in ob.data.polygons]
+
+
+def test_assign_mats_to_polys_skips_unused_slot_without_combined_material(blend_data):
+    mat_a = _new_material(blend_data, 'smc_test_a')
+    mat_b = _new_material(blend_data, 'smc_test_b')
+    mat_unused = _new_material(blend_data, 'smc_test_unused')
+    comb_mat = _new_material(blend_data, 'smc_test_combined')
+    ob = _new_object(blend_data, [mat_a, mat_b, mat_unused], [0, 1, 0])
+    item = {mat_a: 0, mat_b: 0, mat_unused: 1}
+    comb_mats = {0: comb_mat}
+
+    ob_materials = ob.data.materials
+    combiner_ops._assign_mats(item, comb_mats, ob_materials)
+    combiner_ops._assign_mats_to_polys(item, comb_mats, ob, ob_materials)
+
+    assert _poly_mat_indices(ob) == [3, 3, 3]
+
+
+def test_assign_mats_to_polys_keeps_materials_outside_the_combine_list(blend_data):
+    mat_a = _new_material(blend_data, 'smc_test_a')
+    mat_kept = _new_material(blend_data, 'smc_test_kept')
+    comb_mat = _new_material(blend_data, 'smc_test_combined')
+    ob = _new_object(blend_data, [mat_a, mat_kept], [1, 0, 1])
+    item = {mat_a: 0}
+    comb_mats = {0: comb_mat}
+
+    ob_materials = ob.data.materials
+    combiner_ops._assign_mats(item, comb_mats, ob_materials)
+    combiner_ops._assign_mats_to_polys(item, comb_mats, ob, ob_materials)
+
+    assert _poly_mat_indices(ob) == [1, 2, 1]
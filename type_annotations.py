@@ -1,11 +1,12 @@
 from typing import DefaultDict
 from typing import Dict
 from typing import List
+from typing import Set
 from typing import Tuple
 from typing import Union
 
 import bpy
-from mathutils import Vector
+import numpy as np
 
 from . import globs
 
@@ -20,9 +21,9 @@ Scene = bpy.types.ViewLayer if globs.is_blender_2_80_or_newer else bpy.types.Sce
 SMCObDataItem = Dict[bpy.types.Material, int]
 SMCObData = Dict[str, SMCObDataItem]
 
-MatsUV = Dict[str, DefaultDict[bpy.types.Material, List[Vector]]]
+MatsUV = Dict[str, DefaultDict[bpy.types.Material, List[np.ndarray]]]
 
-StructureItem = Dict[str, Union[List, Dict[str, Union[Dict[str, int], Tuple, bpy.types.PackedFile, None]]]]
+StructureItem = Dict[str, Union[List, Set, Dict[str, Union[Dict[str, int], Tuple, bpy.types.PackedFile, None]]]]
 Structure = Dict[bpy.types.Material, StructureItem]
 
 ObMats = Union[bpy.types.bpy_prop_collection, List[bpy.types.Material]]
@@ -32,8 +33,9 @@ CombMats = Dict[int, bpy.types.Material]
 MatDictItem = List[bpy.types.Material]
 MatDict = DefaultDict[Tuple, MatDictItem]
 
-CombineListDataMat = Dict[str, Union[int, bool]]
-CombineListDataItem = Dict[str, Union[Dict[bpy.types.Material, CombineListDataMat], bool]]
+CombineListDataMat = Tuple[bool, int]
+CombineListDataItem = Tuple[bool, Dict[bpy.types.Material, CombineListDataMat]]
 CombineListData = Dict[bpy.types.Object, CombineListDataItem]
+CombineListRow = Tuple[int, Union[bpy.types.Object, None], int, Union[bpy.types.Material, None], bool, int]
 
 Diffuse = Union[bpy.types.bpy_prop_collection, Tuple[float, float, float], Tuple[int, int, int]]
@@ -4,6 +4,8 @@ from .. import bl_info
 from ..icons import get_icon_id
 from .. import globs
 
+version_label = 'Material Combiner {0}'.format('.'.join(map(str, bl_info['version'])))
+
 
 class CreditsMenu(bpy.types.Panel):
     bl_label = 'Credits'
@@ -13,16 +15,11 @@ class CreditsMenu(bpy.types.Panel):
     bl_category = 'MatCombiner'
 
     def draw(self, context: bpy.types.Context) -> None:
-        github = 'https://github.com/Grim-es/material-combiner-addon/issues'
-        discord = 'https://discordapp.com/users/275608234595713024'
-        patreon = 'https://www.patreon.com/shotariya'
-        buymeacoffee = 'https://buymeacoffee.com/shotariya'
-
         m_col = self.layout.column()
         box = m_col.box()
         col = box.column()
         col.scale_y = 1.2
-        col.label(text='Material Combiner {0}'.format(bl_info['version']), icon_value=get_icon_id('smc'))
+        col.label(text=version_label, icon_value=get_icon_id('smc'))
         row = box.row(align=True)
         row.scale_y = 1.2
         row.alignment = 'LEFT'
@@ -32,9 +29,11 @@ class CreditsMenu(bpy.types.Panel):
         col.scale_y = 1.2
         col.label(text='If you have found a bug:')
         col.operator('smc.browser', text='Contact me on Discord (@shotariya)',
-                     icon_value=get_icon_id('discord')).link = discord
-        col.operator('smc.browser', text='Report a Bug on GitHub', icon_value=get_icon_id('github')).link = github
+                     icon_value=get_icon_id('discord')).link = globs.DISCORD_URL
+        col.operator('smc.browser', text='Report a Bug on GitHub',
+                     icon_value=get_icon_id('github')).link = globs.GITHUB_ISSUES_URL
         col.separator()
         col.label(text='If this saved you time:')
-        col.operator('smc.browser', text='Support Material Combiner', icon_value=get_icon_id('patreon')).link = patreon
-        col.operator('smc.browser', text='Buy Me a Coffee', icon_value=get_icon_id('bmc')).link = buymeacoffee
+        col.operator('smc.browser', text='Support Material Combiner',
+                     icon_value=get_icon_id('patreon')).link = globs.PATREON_URL
+        col.operator('smc.browser', text='Buy Me a Coffee', icon_value=get_icon_id('bmc')).link = globs.BUYMEACOFFEE_URL
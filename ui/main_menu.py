@@ -18,12 +18,8 @@ class MaterialMenu(bpy.types.Panel):
         col = layout.column(align=True)
         if globs.pil_exist:
             self._materials_list(col, scn, layout)
-        elif globs.smc_pi:
-            col = col.box().column()
-            col.label(text='Installation complete', icon_value=get_icon_id('done'))
-            col.label(text='Please restart Blender', icon_value=get_icon_id('null'))
         else:
-            self.pillow_installator(col)
+            self.pillow_state(col)
 
     @staticmethod
     def _materials_list(col: bpy.types.UILayout, scn: Scene, layout: bpy.types.UIList) -> None:
@@ -70,9 +66,16 @@ class MaterialMenu(bpy.types.Panel):
         col.operator('smc.combiner', text='Save Atlas to..', icon_value=get_icon_id('null')).cats = False
 
     @staticmethod
-    def pillow_installator(col: bpy.types.UILayout) -> None:
-        discord = 'https://discordapp.com/users/275608234595713024'
+    def pillow_state(col: bpy.types.UILayout) -> None:
+        if globs.smc_pi:
+            col = col.box().column()
+            col.label(text='Installation complete', icon_value=get_icon_id('done'))
+            col.label(text='Please restart Blender', icon_value=get_icon_id('null'))
+        else:
+            MaterialMenu.pillow_installator(col)
 
+    @staticmethod
+    def pillow_installator(col: bpy.types.UILayout) -> None:
         col.label(text='Python Imaging Library required to continue')
         col.separator()
         row = col.row()
@@ -86,4 +89,4 @@ class MaterialMenu(bpy.types.Panel):
                        '\nor check your Internet Connection.')
         col.separator()
         col.label(text='If the error persists, contact me on Discord for a manual installation:')
-        col.operator('smc.browser', text='shotariya#4269', icon_value=get_icon_id('help')).link = discord
+        col.operator('smc.browser', text='shotariya#4269', icon_value=get_icon_id('help')).link = globs.DISCORD_URL
@@ -1,38 +1,54 @@
-import math
-from collections import defaultdict
-from typing import List, Dict
+from typing import Dict, Tuple
 
 import bpy
-from mathutils import Vector
+import numpy as np
 
 
-def get_polys(ob: bpy.types.Object) -> Dict[int, bpy.types.MeshPolygon]:
-    polys = defaultdict(list)
-    for poly in ob.data.polygons:
-        polys[poly.material_index].append(poly)
-    return polys
+def get_material_indices(ob: bpy.types.Object) -> np.ndarray:
+    polys = ob.data.polygons
+    material_index = np.empty(len(polys), dtype=np.int32)
+    polys.foreach_get('material_index', material_index)
+    return material_index
 
 
-def get_uv(ob: bpy.types.Object, poly: bpy.types.MeshPolygon) -> List[Vector]:
+def set_material_indices(ob: bpy.types.Object, material_index: np.ndarray) -> None:
+    ob.data.polygons.foreach_set('material_index', material_index.astype(np.int32))
+
+
+def get_loops_data(ob: bpy.types.Object) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    polys = ob.data.polygons
+    loop_start = np.empty(len(polys), dtype=np.int32)
+    loop_total = np.empty(len(polys), dtype=np.int32)
+    material_index = np.empty(len(polys), dtype=np.int32)
+    polys.foreach_get('loop_start', loop_start)
+    polys.foreach_get('loop_total', loop_total)
+    polys.foreach_get('material_index', material_index)
+    order = np.argsort(loop_start)
+    return loop_start[order], loop_total[order], material_index[order]
+
+
+def get_loops_by_material(loop_total: np.ndarray, material_index: np.ndarray) -> Dict[int, np.ndarray]:
+    loop_mat_indices = np.repeat(material_index, loop_total)
+    order = np.argsort(loop_mat_indices, kind='stable')
+    indices, starts = np.unique(loop_mat_indices[order], return_index=True)
+    return dict(zip(indices.tolist(), np.split(order, starts[1:])))
+
+
+def get_uv(ob: bpy.types.Object) -> np.ndarray:
     data = ob.data.uv_layers.active.data
-    return [data[loop_idx].uv if loop_idx < len(data) else Vector((0, 0, 0)) for loop_idx in poly.loop_indices]
+    uv = np.empty(len(data) * 2, dtype=np.float32)
+    data.foreach_get('uv', uv)
+    return uv.reshape(-1, 2).astype(np.float64)
 
 
-def align_uv(face_uv: List[Vector]) -> List[Vector]:
-    min_x = float('inf')
-    min_y = float('inf')
+def set_uv(ob: bpy.types.Object, uv: np.ndarray) -> None:
+    ob.data.uv_layers.active.data.foreach_set('uv', uv.astype(np.float32).ravel())
 
-    for uv in face_uv:
-        if not math.isnan(uv.x):
-            min_x = min(min_x, uv.x)
-        if not math.isnan(uv.y):
-            min_y = min(min_y, uv.y)
 
-    min_x = math.floor(min_x)
-    min_y = math.floor(min_y)
+def align_uv(uv: np.ndarray, loop_start: np.ndarray, loop_total: np.ndarray, face_mask: np.ndarray) -> None:
+    if not loop_start.size:
+        return
 
-    if min_x != 0 or min_y != 0:
-        for uv in face_uv:
-            uv.x -= min_x
-            uv.y -= min_y
-    return face_uv
+    min_uv = np.floor(np.fmin.reduceat(uv, loop_start, axis=0))
+    min_uv[~face_mask] = 0
+    uv -= np.repeat(np.nan_to_num(min_uv), loop_total, axis=0)